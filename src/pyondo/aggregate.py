@@ -0,0 +1,80 @@
+from math import isnan
+
+from .calibration import CELSIUS
+from .dht import DHT_GOOD
+
+
+def _round(value):
+    # NaN is not valid JSON, so it is published as null instead.
+    if isnan(value):
+        return None
+
+    return round(value, 2)
+
+
+def _reading_values(datum):
+    return {
+        'temperature': datum.temperature,
+        'humidity': datum.humidity,
+        'heat_index': _round(datum.heat_index),
+        'dew_point': _round(datum.dew_point),
+    }
+
+
+def to_message(datum, unit=CELSIUS):
+    """
+    Convert a reading into the dictionary published to the broker.
+
+    The unit tells which of celsius or fahrenheit the temperature,
+    heat index and dew point are expressed in.
+    """
+    message = _reading_values(datum)
+    message['unit'] = unit
+
+    return message
+
+
+def _summarise(values):
+    values = [value for value in values if not isnan(value)]
+
+    if not values:
+        return None
+
+    return {
+        'min': round(min(values), 2),
+        'max': round(max(values), 2),
+        'mean': round(sum(values) / len(values), 2),
+    }
+
+
+def aggregate(host, data, status=DHT_GOOD, unit=CELSIUS):
+    """
+    Combine the readings of one sweep over the sensors of a host
+    into a single message.
+
+    Only readings with the given status or lower are included in the
+    readings and in the temperature and dew point rollups. The count
+    of bad statuses covers every reading of the sweep.
+    """
+    included = [datum for datum in data if datum.status <= status]
+    readings = []
+
+    for datum in included:
+        message = _reading_values(datum)
+        message['gpio'] = datum.gpio
+        message['status'] = datum.status
+        readings.append(message)
+
+    return {
+        'host': host,
+        'unit': unit,
+        'timestamp': min((datum.timestamp for datum in data), default=None),
+        'readings': readings,
+        'rollup': {
+            'temperature': _summarise(
+                datum.temperature for datum in included),
+            'dew_point': _summarise(datum.dew_point for datum in included),
+            'bad_status_count': sum(
+                datum.status != DHT_GOOD for datum in data),
+        },
+    }
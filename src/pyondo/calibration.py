@@ -0,0 +1,291 @@
+import json
+from bisect import bisect_right
+from numbers import Real
+
+from .dht import DhtSensor
+from .dht import to_fahrenheit
+
+CELSIUS = 'C'
+FAHRENHEIT = 'F'
+
+
+def _identity(value):
+    return value
+
+
+def _is_number(value):
+    return isinstance(value, Real) and not isinstance(value, bool)
+
+
+def linear(gain=1.0, offset=0.0):
+    """
+    Return a correction computing value * gain + offset.
+    """
+    if not _is_number(gain) or not _is_number(offset):
+        raise ValueError('Calibration gain and offset should be numbers')
+
+    if gain == 1.0 and offset == 0.0:
+        return _identity
+
+    def _correct(value):
+        return value * gain + offset
+
+    return _correct
+
+
+def piecewise(points):
+    """
+    Return a correction interpolating linearly between a list of
+    (raw, corrected) points.
+
+    Values outside of the given points are extrapolated from the
+    nearest segment.
+    """
+    valid_points = isinstance(points, (list, tuple)) and all(
+        isinstance(point, (list, tuple)) and
+        len(point) == 2 and
+        all(_is_number(value) for value in point)
+        for point in points
+    )
+
+    if not valid_points:
+        raise ValueError(
+            'Calibration points should be a list of [raw, corrected] pairs')
+
+    points = sorted(points)
+
+    if len(points) < 2:
+        raise ValueError('Piecewise calibration needs at least two points')
+
+    raws = tuple(raw for raw, _ in points)
+    segments = []
+
+    for (x0, y0), (x1, y1) in zip(points, points[1:]):
+        if x0 == x1:
+            raise ValueError('Duplicate calibration point: {}'.format(x0))
+
+        slope = (y1 - y0) / (x1 - x0)
+        segments.append((slope, y0 - slope * x0))
+
+    segments = tuple(segments)
+    upper = len(raws) - 1
+
+    def _correct(value):
+        slope, intercept = segments[bisect_right(raws, value, 1, upper) - 1]
+        return value * slope + intercept
+
+    return _correct
+
+
+def _check_keys(spec, allowed):
+    if not isinstance(spec, dict):
+        raise ValueError('Calibration entry should be a dictionary')
+
+    unknown = set(spec) - set(allowed)
+
+    if unknown:
+        raise ValueError(
+            'Unknown calibration keys: {}'.format(', '.join(sorted(unknown))))
+
+
+def _compile_correction(spec):
+    if spec is None:
+        return _identity
+
+    _check_keys(spec, ('gain', 'offset', 'points'))
+
+    if 'points' in spec:
+        if 'gain' in spec or 'offset' in spec:
+            raise ValueError(
+                'Calibration points cannot be combined with gain or offset')
+
+        return piecewise(spec['points'])
+
+    return linear(
+        gain=spec.get('gain', 1.0),
+        offset=spec.get('offset', 0.0)
+    )
+
+
+class Calibrator:
+    """
+    A class to apply per-GPIO calibration and unit conversion
+    to sensor readings.
+    """
+    def __init__(self, table=None, unit=CELSIUS):
+        """
+        Instantiate with an optional calibration table and output unit.
+
+        The table maps a GPIO to a dictionary with optional temperature
+        and humidity entries. Each entry is either linear, given as
+        {'gain': 1.0, 'offset': 0.0}, or piecewise, given as
+        {'points': [[raw, corrected], ...]}. Temperature corrections
+        are expressed in celsius. Unknown keys or values of the wrong
+        type raise a ValueError.
+
+        The unit may be one of CELSIUS or FAHRENHEIT and applies to
+        temperature, heat index and dew point.
+
+        Each GPIO entry is compiled once into a single transform, so
+        that applying it involves no parsing of the table.
+        """
+        if unit not in (CELSIUS, FAHRENHEIT):
+            raise ValueError('Unit should be either C or F')
+
+        if table is None:
+            table = {}
+        elif not isinstance(table, dict):
+            raise ValueError('Calibration table should be a dictionary')
+
+        self._unit = unit
+        self._default = self._compile({})
+        self._transforms = {}
+
+        for gpio, spec in table.items():
+            try:
+                gpio = int(gpio)
+            except (TypeError, ValueError):
+                raise ValueError('Invalid calibration GPIO: {}'.format(gpio))
+
+            self._transforms[gpio] = self._compile(spec)
+
+    @classmethod
+    def load(cls, path, unit=CELSIUS):
+        """
+        Instantiate from a JSON file containing the calibration table.
+        """
+        with open(path) as file:
+            return cls(json.load(file), unit)
+
+    @property
+    def unit(self):
+        return self._unit
+
+    def _compile(self, spec):
+        _check_keys(spec, ('temperature', 'humidity'))
+        correct_temperature = _compile_correction(spec.get('temperature'))
+        correct_humidity = _compile_correction(spec.get('humidity'))
+        corrected = not (
+            correct_temperature is _identity and
+            correct_humidity is _identity
+        )
+
+        if self._unit == FAHRENHEIT:
+            convert = to_fahrenheit
+        elif corrected:
+            convert = _identity
+        else:
+            return _identity, list
+
+        def _transform(datum):
+            if corrected:
+                temperature = correct_temperature(datum.temperature)
+                humidity = correct_humidity(datum.humidity)
+                heat_index = DhtSensor.calculate_heat_index(
+                    temperature,
+                    humidity
+                )
+                dew_point = DhtSensor.calculate_dew_point(
+                    temperature,
+                    humidity
+                )
+            else:
+                temperature = datum.temperature
+                humidity = datum.humidity
+                heat_index = datum.heat_index
+                dew_point = datum.dew_point
+
+            return datum._replace(
+                temperature=convert(temperature),
+                humidity=humidity,
+                heat_index=convert(heat_index),
+                dew_point=convert(dew_point),
+            )
+
+        def _transform_many(data):
+            temperatures = [datum.temperature for datum in data]
+            humidities = [datum.humidity for datum in data]
+
+            if corrected:
+                temperatures = list(map(correct_temperature, temperatures))
+                humidities = list(map(correct_humidity, humidities))
+                heat_indices = list(map(
+                    DhtSensor.calculate_heat_index,
+                    temperatures,
+                    humidities
+                ))
+                dew_points = list(map(
+                    DhtSensor.calculate_dew_point,
+                    temperatures,
+                    humidities
+                ))
+            else:
+                heat_indices = [datum.heat_index for datum in data]
+                dew_points = [datum.dew_point for datum in data]
+
+            rows = zip(
+                data,
+                temperatures,
+                humidities,
+                heat_indices,
+                dew_points
+            )
+
+            return [
+                datum._replace(
+                    temperature=convert(temperature),
+                    humidity=humidity,
+                    heat_index=convert(heat_index),
+                    dew_point=convert(dew_point),
+                )
+                for datum, temperature, humidity, heat_index, dew_point
+                in rows
+            ]
+
+        return _transform, _transform_many
+
+    def transform(self, gpio):
+        """
+        Return the compiled transform of a single reading of the
+        given GPIO.
+        """
+        return self._transforms.get(gpio, self._default)[0]
+
+    def transform_many(self, gpio):
+        """
+        Return the compiled transform of a list of readings of the
+        given GPIO, which corrects them column by column.
+        """
+        return self._transforms.get(gpio, self._default)[1]
+
+    def apply(self, datum):
+        """
+        Return the calibrated and converted copy of a reading.
+        """
+        return self.transform(datum.gpio)(datum)
+
+    def apply_all(self, data):
+        """
+        Return the calibrated and converted copies of stored readings,
+        in their original order.
+
+        Readings are grouped by GPIO, so that each transform is resolved
+        once per group and applied to whole columns of temperature and
+        humidity.
+        """
+        data = list(data)
+        groups = {}
+
+        for index, datum in enumerate(data):
+            groups.setdefault(datum.gpio, []).append(index)
+
+        result = [None] * len(data)
+
+        for gpio, indices in groups.items():
+            transformed = self.transform_many(gpio)(
+                [data[index] for index in indices])
+
+            for index, datum in zip(indices, transformed):
+                result[index] = datum
+
+        return result
@@ -1,5 +1,7 @@
+import cProfile
 import json
 import logging
+import socket
 import sys
 import time
 import uuid
@@ -8,7 +10,17 @@ import click
 import paho.mqtt.client as mqtt
 import pigpio
 
+from .aggregate import aggregate
+from .aggregate import to_message
+from .calibration import CELSIUS
+from .calibration import FAHRENHEIT
+from .calibration import Calibrator
 from .dht import DhtSensor
+from .profiling import PUBLISH
+from .profiling import STAGES
+from .profiling import Profiler
+from .scheduler import AdaptiveScheduler
+from .simulator import SimulatedPi
 
 
 @click.group()
@@ -16,11 +28,131 @@ def cmd():
     pass
 
 
+def _load_calibrator(calibration, fahrenheit):
+    unit = FAHRENHEIT if fahrenheit else CELSIUS
+
+    if calibration is None:
+        return Calibrator(unit=unit)
+
+    try:
+        return Calibrator.load(calibration, unit)
+    except ValueError as error:
+        logging.error('Invalid calibration file: %s', error)
+        sys.exit()
+
+
+def _connect_client(broker):
+    def _on_connect(client, userdata, flags, rc):
+        if rc == 0:
+            logging.info('Connected to broker')
+            client.connected_flag = True
+        else:
+            logging.error('Connection to broker failed')
+
+    client = mqtt.Client('pyondo-{}'.format(uuid.uuid4()))
+    client.on_connect = _on_connect
+    client.connected_flag = False
+    client.connect(broker)
+
+    client.loop_start()
+    retry_count = 0
+
+    while not client.connected_flag:
+        if retry_count < 5:
+            time.sleep(1)
+            retry_count += 1
+        else:
+            logging.error('Maximum retry count has been exceeded')
+            sys.exit()
+
+    return client
+
+
+def _create_scheduler(gpios, pause, max_pause):
+    if max_pause is None:
+        return None
+
+    scheduler = AdaptiveScheduler(max_interval=max_pause, min_interval=pause)
+
+    for gpio in gpios:
+        scheduler.add(gpio)
+
+    return scheduler
+
+
+def _read_due_sensors(sensors, scheduler):
+    for gpio in scheduler.due():
+        now = time.monotonic()
+        interval = scheduler.update(sensors[gpio].read(), now)
+        logging.debug('Sampling GPIO %s every %.1f seconds', gpio, interval)
+
+    time.sleep(max(scheduler.next_due() - time.monotonic(), 0))
+
+
+def _read_sweep(sensors, scheduler):
+    data = []
+
+    for gpio, sensor in sensors:
+        now = time.monotonic()
+        datum = sensor.read()
+        data.append(datum)
+
+        if scheduler is not None:
+            interval = scheduler.update(datum, now)
+            logging.debug(
+                'GPIO %s would be sampled every %.1f seconds',
+                gpio,
+                interval
+            )
+
+    return data
+
+
+def _print_profile(profiler):
+    print(
+        '{:<8} {:>6} {:>10} {:>10} {:>10} {:>10} {:>10}'
+        .format(
+            'Stage',
+            'Count',
+            'Mean(ms)',
+            'p50(ms)',
+            'p90(ms)',
+            'p99(ms)',
+            'Max(ms)'
+        )
+    )
+
+    summary = profiler.summary()
+
+    for stage in STAGES:
+        stats = summary[stage]
+
+        if stats is None:
+            continue
+
+        print(
+            '{:<8} {:>6d} {:>10.3f} {:>10.3f} {:>10.3f} {:>10.3f} {:>10.3f}'
+            .format(
+                stage,
+                stats['count'],
+                stats['mean'],
+                stats['p50'],
+                stats['p90'],
+                stats['p99'],
+                stats['max']
+            )
+        )
+
+
 @cmd.command()
 @click.argument('gpios', nargs=-1, type=click.INT)
 @click.option('--pause', '-p', default=2)
-def test_run(gpios, pause):
+@click.option('--max-pause', '-m', type=click.INT)
+@click.option('--calibration', '-c', type=click.Path(exists=True))
+@click.option('--fahrenheit', '-f', is_flag=True)
+def test_run(gpios, pause, max_pause, calibration, fahrenheit):
     def _callback(data):
+        data = calibrator.apply(data)
         print(
             'Timestamp:{:.3f} '
             'GPIO:{:2d} '
@@ -42,6 +174,12 @@ def test_run(gpios, pause):
         logging.error('Pause time should be at least 2 seconds')
         sys.exit()
 
+    if max_pause is not None and max_pause < pause:
+        logging.error('Maximum pause time should be at least pause time')
+        sys.exit()
+
+    calibrator = _load_calibrator(calibration, fahrenheit)
+    scheduler = _create_scheduler(gpios, pause, max_pause)
     pi = pigpio.pi()
 
     if not pi.connected:
@@ -55,6 +193,10 @@ def test_run(gpios, pause):
 
     while True:
         try:
+            if scheduler is not None:
+                _read_due_sensors(dict(sensors), scheduler)
+                continue
+
             for sensor in sensors:
                 sensor[1].read()
 
@@ -74,9 +216,24 @@ def test_run(gpios, pause):
 @click.argument('broker')
 @click.argument('topic')
 @click.option('--pause', '-p', default=2)
+@click.option('--max-pause', '-m', type=click.INT)
 @click.option('--status', '-s', default=0)
+@click.option('--calibration', '-c', type=click.Path(exists=True))
+@click.option('--fahrenheit', '-f', is_flag=True)
+@click.option('--profile', is_flag=True)
 @click.option('--verbose', '-v', is_flag=True)
-def publish(gpio, broker, topic, pause, status, verbose):
+def publish(
+    gpio,
+    broker,
+    topic,
+    pause,
+    max_pause,
+    status,
+    calibration,
+    fahrenheit,
+    profile,
+    verbose
+):
     if verbose:
         logging.basicConfig(level=logging.DEBUG)
 
@@ -84,54 +241,45 @@ def publish(gpio, broker, topic, pause, status, verbose):
         logging.error('Pause time should be at least 2 seconds')
         sys.exit()
 
+    if max_pause is not None and max_pause < pause:
+        logging.error('Maximum pause time should be at least pause time')
+        sys.exit()
+
     if status < 0 or status > 2:
         logging.error('Status should be between 0 and 2')
         sys.exit()
 
+    calibrator = _load_calibrator(calibration, fahrenheit)
+    scheduler = _create_scheduler([gpio], pause, max_pause)
     pi = pigpio.pi()
 
     if not pi.connected:
         sys.exit()
 
-    def _on_connect(client, userdata, flags, rc):
-        if rc == 0:
-            logging.info('Connected to broker')
-            client.connected_flag = True
-        else:
-            logging.error('Connection to broker failed')
-
-    client = mqtt.Client('pyondo-{}'.format(uuid.uuid4()))
-    client.on_connect = _on_connect
-    client.connected_flag = False
-    client.connect(broker)
-
-    client.loop_start()
-    retry_count = 0
-
-    while not client.connected_flag:
-        if retry_count < 5:
-            time.sleep(1)
-            retry_count += 1
-        else:
-            logging.error('Maximum retry count has been exceeded')
-            sys.exit()
+    client = _connect_client(broker)
 
     def _callback(data):
-        message = json.dumps({
-            'temperature': data.temperature,
-            'humidity': data.humidity,
-            'heat_index': round(data.heat_index, 2),
-            'dew_point': round(data.dew_point, 2),
-        })
+        data = calibrator.apply(data)
+        message = json.dumps(to_message(data, calibrator.unit))
 
         if data.status <= status:
             client.publish(topic, message)
             logging.debug('Published message: %s', message)
 
-    sensor = DhtSensor(pi=pi, gpio=gpio, callback=_callback)
+    profiler = Profiler() if profile else None
+    sensor = DhtSensor(
+        pi=pi,
+        gpio=gpio,
+        callback=_callback,
+        profiler=profiler
+    )
 
     while True:
         try:
+            if scheduler is not None:
+                _read_due_sensors({gpio: sensor}, scheduler)
+                continue
+
             sensor.read()
             time.sleep(pause)
         except KeyboardInterrupt:
@@ -144,3 +292,196 @@ def publish(gpio, broker, topic, pause, status, verbose):
     client.loop_stop()
 
     pi.stop()
+
+    if profiler is not None:
+        _print_profile(profiler)
+
+
+@cmd.command()
+@click.argument('broker')
+@click.argument('topic')
+@click.argument('gpios', nargs=-1, type=click.INT)
+@click.option('--pause', '-p', default=2)
+@click.option('--max-pause', '-m', type=click.INT)
+@click.option('--status', '-s', default=0)
+@click.option('--hostname', '-n')
+@click.option('--calibration', '-c', type=click.Path(exists=True))
+@click.option('--fahrenheit', '-f', is_flag=True)
+@click.option('--profile', is_flag=True)
+@click.option('--verbose', '-v', is_flag=True)
+def publish_sweep(
+    broker,
+    topic,
+    gpios,
+    pause,
+    max_pause,
+    status,
+    hostname,
+    calibration,
+    fahrenheit,
+    profile,
+    verbose
+):
+    if verbose:
+        logging.basicConfig(level=logging.DEBUG)
+
+    if not gpios:
+        logging.error('Need to specify at least one GPIO')
+        sys.exit()
+
+    if pause < 2:
+        logging.error('Pause time should be at least 2 seconds')
+        sys.exit()
+
+    if max_pause is not None and max_pause < pause:
+        logging.error('Maximum pause time should be at least pause time')
+        sys.exit()
+
+    if status < 0 or status > 2:
+        logging.error('Status should be between 0 and 2')
+        sys.exit()
+
+    if hostname is None:
+        hostname = socket.gethostname()
+
+    calibrator = _load_calibrator(calibration, fahrenheit)
+    scheduler = _create_scheduler(gpios, pause, max_pause)
+    pi = pigpio.pi()
+
+    if not pi.connected:
+        sys.exit()
+
+    client = _connect_client(broker)
+    profiler = Profiler() if profile else None
+    sensors = []
+
+    for gpio in gpios:
+        sensor = DhtSensor(pi=pi, gpio=gpio, profiler=profiler)
+        sensors.append((gpio, sensor))
+
+    while True:
+        try:
+            data = calibrator.apply_all(_read_sweep(sensors, scheduler))
+
+            if profiler is not None:
+                start = time.perf_counter_ns()
+
+            message = json.dumps(aggregate(
+                hostname,
+                data,
+                status,
+                calibrator.unit
+            ))
+
+            client.publish(topic, message)
+
+            if profiler is not None:
+                profiler.record(
+                    None,
+                    PUBLISH,
+                    time.perf_counter_ns() - start
+                )
+
+            logging.debug('Published message: %s', message)
+
+            # Every sensor is read on each sweep, so the next sweep
+            # follows the sensor with the shortest interval.
+            if scheduler is not None:
+                time.sleep(max(scheduler.next_due() - time.monotonic(), 0))
+            else:
+                time.sleep(pause)
+        except KeyboardInterrupt:
+            break
+
+    for sensor in sensors:
+        sensor[1].cancel()
+        logging.info('Cancelling %s', sensor[0])
+
+    client.disconnect()
+    client.loop_stop()
+
+    pi.stop()
+
+    if profiler is not None:
+        _print_profile(profiler)
+
+
+@cmd.command()
+@click.argument('gpios', nargs=-1, type=click.INT)
+@click.option('--count', '-n', default=100)
+@click.option('--pause', '-p', type=click.FLOAT)
+@click.option('--simulate', '-s', is_flag=True)
+@click.option('--cprofile', '-o', type=click.Path())
+@click.option('--collapsed', '-g', type=click.Path())
+def profile(gpios, count, pause, simulate, cprofile, collapsed):
+    def _callback(data):
+        json.dumps(to_message(data))
+
+    logging.basicConfig(level=logging.INFO)
+
+    if not gpios:
+        logging.error('Need to specify at least one GPIO')
+        sys.exit()
+
+    if count < 1:
+        logging.error('Count should be at least 1')
+        sys.exit()
+
+    if pause is None:
+        pause = 0 if simulate else 2
+
+    if pause < 2 and not simulate:
+        logging.error('Pause time should be at least 2 seconds')
+        sys.exit()
+
+    if simulate:
+        pi = SimulatedPi({gpio: (21.5, 45.0) for gpio in gpios})
+    else:
+        pi = pigpio.pi()
+
+    if not pi.connected:
+        sys.exit()
+
+    profiler = Profiler()
+    sensors = []
+
+    for gpio in gpios:
+        sensor = DhtSensor(
+            pi=pi,
+            gpio=gpio,
+            callback=_callback,
+            profiler=profiler
+        )
+        sensors.append((gpio, sensor))
+
+    if cprofile is not None:
+        python_profiler = cProfile.Profile()
+        python_profiler.enable()
+
+    try:
+        for index in range(count):
+            for sensor in sensors:
+                sensor[1].read()
+
+            if index < count - 1:
+                time.sleep(pause)
+    except KeyboardInterrupt:
+        pass
+
+    if cprofile is not None:
+        python_profiler.disable()
+        python_profiler.dump_stats(cprofile)
+        logging.info('Wrote cProfile statistics to %s', cprofile)
+
+    for sensor in sensors:
+        sensor[1].cancel()
+
+    pi.stop()
+
+    _print_profile(profiler)
+
+    if collapsed is not None:
+        with open(collapsed, 'w') as file:
+            file.write('\n'.join(profiler.collapsed()) + '\n')
+
+        logging.info('Wrote collapsed stacks to %s', collapsed)
@@ -1,3 +1,4 @@
+import threading
 import time
 from math import log
 from math import log10
@@ -7,6 +8,12 @@ from collections import namedtuple
 
 import pigpio
 
+from .profiling import CALLBACK
+from .profiling import DECODE
+from .profiling import DERIVE
+from .profiling import TRIGGER
+from .profiling import WAIT
+
 DHT_AUTO = 0
 DHT11 = 1
 DHTXX = 2
@@ -16,12 +23,32 @@ DHT_BAD_CHECKSUM = 1
 DHT_BAD_DATA = 2
 DHT_TIMEOUT = 3
 
+_Reading = namedtuple(
+    '_Reading',
+    ['sequence', 'status', 'temperature', 'humidity']
+)
+
+
+def to_fahrenheit(celsius):
+    return (celsius * 1.8) + 32
+
+
+def to_celsius(fahrenheit):
+    return (fahrenheit - 32) / 1.8
+
 
 class DhtSensor:
     """
     A class to read the DHTXX temperature/humidity sensors.
     """
-    def __init__(self, pi, gpio, model=DHT_AUTO, callback=None):
+    def __init__(
+        self,
+        pi,
+        gpio,
+        model=DHT_AUTO,
+        callback=None,
+        profiler=None
+    ):
         """
         Instantiate with the Pi and the GPIO connected to the
         DHT temperature and humidity sensor.
@@ -44,22 +71,35 @@ class DhtSensor:
         1 DHT_BAD_CHECKSUM (receieved data failed checksum check)
         2 DHT_BAD_DATA (data receieved had one or more invalid values)
         3 DHT_TIMEOUT (no response from sensor)
+
+        Optionally a profiler may be specified. If specified the
+        duration of each stage of a reading is recorded to it.
         """
         self._pi = pi
         self._gpio = gpio
         self._model = model
         self._callback = callback
+        self._profiler = profiler
 
-        self._new_data = False
         self._in_code = False
 
         self._bits = 0
         self._code = 0
 
-        self._status = DHT_TIMEOUT
+        # The decoder runs in pigpio's callback thread and publishes
+        # each result as one immutable _Reading, so a reader never sees
+        # fields of two different readings. Only read() advances the
+        # sequence, which tells the decoder which trigger it answers.
+        self._read_lock = threading.Lock()
+        self._sequence = 0
         self._timestamp = time.time()
-        self._temperature = 0.0
-        self._humidity = 0.0
+        self._reading = _Reading(
+            sequence=0,
+            status=DHT_TIMEOUT,
+            temperature=0.0,
+            humidity=0.0
+        )
+        self._latest = None
         self._Datum = namedtuple(
             'Datum',
             [
@@ -103,7 +143,13 @@ class DhtSensor:
 
             if self._in_code:
                 if self._bits == 40:
-                    self._decode_dhtxx()
+                    if self._profiler is None:
+                        self._decode_dhtxx()
+                    else:
+                        start = time.perf_counter_ns()
+                        self._decode_dhtxx()
+                        self._record(DECODE, start)
+
                     self._in_code = False
 
     def _decode_dhtxx(self):
@@ -134,6 +180,9 @@ class DhtSensor:
         byte4 = self._code >> 32 & 0xff
 
         checksum = (byte1 + byte2 + byte3 + byte4) & 0xFF
+        last_reading = self._reading
+        temperature = last_reading.temperature
+        humidity = last_reading.humidity
 
         if checksum == byte0:
             if self._model == DHT11:
@@ -151,15 +200,20 @@ class DhtSensor:
                         self._validate_dht11(byte1, byte2, byte3, byte4))
 
             if valid_readings:
-                self._temperature = temperature
-                self._humidity = humidity
-                self._status = DHT_GOOD
+                status = DHT_GOOD
             else:
-                self._status = DHT_BAD_DATA
+                temperature = last_reading.temperature
+                humidity = last_reading.humidity
+                status = DHT_BAD_DATA
         else:
-            self._status = DHT_BAD_CHECKSUM
+            status = DHT_BAD_CHECKSUM
 
-        self._new_data = True
+        self._reading = _Reading(
+            sequence=self._sequence,
+            status=status,
+            temperature=temperature,
+            humidity=humidity
+        )
 
     @classmethod
     def _validate_dht11(cls, byte1, byte2, byte3, byte4):
@@ -209,40 +263,82 @@ class DhtSensor:
         1 DHT_BAD_CHECKSUM (receieved data failed checksum check)
         2 DHT_BAD_DATA (data receieved had one or more invalid values)
         3 DHT_TIMEOUT (no response from sensor)
+
+        Concurrent calls are serialised, as the sensor can only answer
+        one trigger at a time.
         """
-        self._trigger()
-
-        for _ in range(5):
-            if self._new_data:
-                break
-
-            time.sleep(0.05)
-
-        datum = self._Datum(
-            timestamp=self._timestamp,
-            gpio=self._gpio,
-            status=self._status,
-            temperature=self._temperature,
-            humidity=self._humidity,
-            heat_index=self.calculate_heat_index(
-                self._temperature,
-                self._humidity
-            ),
-            dew_point=self.calculate_dew_point(
-                self._temperature,
-                self._humidity
-            ),
-        )
+        profiling = self._profiler is not None
+
+        with self._read_lock:
+            if profiling:
+                start = time.perf_counter_ns()
+
+            self._trigger()
+
+            if profiling:
+                start = self._record(TRIGGER, start)
+
+            for _ in range(5):
+                reading = self._reading
+
+                if reading.sequence == self._sequence:
+                    status = reading.status
+                    break
+
+                time.sleep(0.05)
+            else:
+                status = DHT_TIMEOUT
+
+            if profiling:
+                start = self._record(WAIT, start)
+
+            datum = self._Datum(
+                timestamp=self._timestamp,
+                gpio=self._gpio,
+                status=status,
+                temperature=reading.temperature,
+                humidity=reading.humidity,
+                heat_index=self.calculate_heat_index(
+                    reading.temperature,
+                    reading.humidity
+                ),
+                dew_point=self.calculate_dew_point(
+                    reading.temperature,
+                    reading.humidity
+                ),
+            )
+            self._latest = datum
+
+            if profiling:
+                start = self._record(DERIVE, start)
 
         if self._callback is not None:
             self._callback(datum)
 
+            if profiling:
+                self._record(CALLBACK, start)
+
         return datum
 
+    def _record(self, stage, start):
+        end = time.perf_counter_ns()
+        self._profiler.record(self._gpio, stage, end - start)
+
+        return end
+
+    @property
+    def latest(self):
+        """
+        The most recent datum returned by read(), or None.
+
+        This never blocks, so any number of threads may poll it while
+        another thread keeps reading the sensor.
+        """
+        return self._latest
+
     def _trigger(self):
-        self._new_data = False
+        self._sequence += 1
         self._timestamp = time.time()
-        self._status = DHT_TIMEOUT
 
         self._pi.write(gpio=self._gpio, level=0)
 
@@ -258,13 +354,7 @@ class DhtSensor:
         """
         Calculate heat index given celsius temperature and relative humidity.
         """
-        def _to_fahrenheit(celsius):
-            return (celsius * 1.8) + 32
-
-        def _to_celsius(fahrenheit):
-            return (fahrenheit - 32) / 1.8
-
-        fahrenheit = _to_fahrenheit(temperature)
+        fahrenheit = to_fahrenheit(temperature)
 
         heat_index = 0.5 * (
             fahrenheit
@@ -297,7 +387,7 @@ class DhtSensor:
                     * ((87.0 - fahrenheit) * 0.2)
                 )
 
-        return _to_celsius(heat_index)
+        return to_celsius(heat_index)
 
     @staticmethod
     def calculate_dew_point(temperature, humidity):
@@ -0,0 +1,108 @@
+TRIGGER = 'trigger'
+WAIT = 'wait'
+DECODE = 'decode'
+DERIVE = 'derive'
+CALLBACK = 'callback'
+PUBLISH = 'publish'
+
+STAGES = (TRIGGER, WAIT, DECODE, DERIVE, CALLBACK, PUBLISH)
+
+_STACKS = {
+    TRIGGER: 'pyondo;read;trigger',
+    WAIT: 'pyondo;read;wait',
+    DECODE: 'pyondo;edge;decode',
+    DERIVE: 'pyondo;read;derive',
+    CALLBACK: 'pyondo;read;callback',
+    PUBLISH: 'pyondo;sweep;publish',
+}
+
+
+def _percentile(ordered, percent):
+    index = max(int(round(percent / 100.0 * len(ordered))) - 1, 0)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+class Profiler:
+    """
+    A class to time the stages of the sensor read pipeline.
+    """
+    def __init__(self, hooks=None):
+        """
+        Optionally a list of hooks may be specified. Each hook is
+        called with GPIO, stage and elapsed nanoseconds whenever a
+        stage completes.
+
+        The stage will be one of:
+        trigger (pulling the GPIO low to start a reading)
+        wait (waiting for the sensor to answer)
+        decode (decoding the received bits, in pigpio's callback thread)
+        derive (calculating heat index and dew point)
+        callback (running the user callback)
+        publish (building and publishing a sweep message)
+
+        The publish stage covers a whole sweep rather than one sensor,
+        so its hooks receive None as GPIO.
+        """
+        self._hooks = list(hooks or [])
+        self._samples = {stage: [] for stage in STAGES}
+
+    def add_hook(self, hook):
+        self._hooks.append(hook)
+
+    def record(self, gpio, stage, elapsed):
+        """
+        Record the elapsed nanoseconds of a stage.
+        """
+        self._samples[stage].append(elapsed)
+
+        for hook in self._hooks:
+            hook(gpio, stage, elapsed)
+
+    def samples(self, stage):
+        return list(self._samples[stage])
+
+    def clear(self):
+        for samples in self._samples.values():
+            samples.clear()
+
+    def summary(self, percentiles=(50, 90, 99)):
+        """
+        Return count, mean, percentiles and maximum of each stage
+        in milliseconds.
+        """
+        summary = {}
+
+        for stage in STAGES:
+            ordered = sorted(self._samples[stage])
+
+            if not ordered:
+                summary[stage] = None
+                continue
+
+            stats = {
+                'count': len(ordered),
+                'mean': sum(ordered) / len(ordered) / 1e6,
+            }
+
+            for percent in percentiles:
+                stats['p{}'.format(percent)] = (
+                    _percentile(ordered, percent) / 1e6)
+
+            stats['max'] = ordered[-1] / 1e6
+            summary[stage] = stats
+
+        return summary
+
+    def collapsed(self):
+        """
+        Return the total microseconds of each stage as lines of
+        collapsed stacks, as read by flamegraph.pl and speedscope.
+        """
+        return [
+            '{} {}'.format(
+                _STACKS[stage],
+                sum(self._samples[stage]) // 1000
+            )
+            for stage in STAGES
+            if self._samples[stage]
+        ]
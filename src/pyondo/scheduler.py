@@ -0,0 +1,150 @@
+import time
+from math import isnan
+
+from .dht import DHT_GOOD
+
+MIN_INTERVAL = 2.0
+
+
+class AdaptiveScheduler:
+    """
+    A class to adapt the sampling interval of each sensor to how fast
+    its readings change.
+    """
+    def __init__(
+        self,
+        max_interval=60.0,
+        min_interval=MIN_INTERVAL,
+        threshold=0.2,
+        backoff=1.5
+    ):
+        """
+        Instantiate with the bounds of the sampling interval in seconds.
+        The minimum interval may not be shorter than 2 seconds, which
+        is the fastest a DHT sensor can be read.
+
+        Optionally the threshold may be specified. It is the change in
+        celsius of either temperature or dew point which is allowed
+        between two samples. The interval is chosen so that, at the
+        recent rate of change, readings move by about the threshold.
+
+        Optionally the backoff may be specified. When readings are
+        stable the interval grows by at most this factor per sample,
+        while it shrinks at once on a transient.
+        """
+        if min_interval < MIN_INTERVAL:
+            raise ValueError('Minimum interval should be at least 2 seconds')
+
+        if max_interval < min_interval:
+            raise ValueError(
+                'Maximum interval should not be less than minimum interval')
+
+        self._min_interval = min_interval
+        self._max_interval = max_interval
+        self._threshold = threshold
+        self._backoff = backoff
+
+        # Due and sample times use time.monotonic(), so that steps of
+        # the wall clock, e.g. from NTP on a Pi without RTC, neither
+        # stall nor flood the schedule.
+        self._intervals = {}
+        self._due = {}
+        self._last_samples = {}
+
+    def add(self, gpio, now=None):
+        """
+        Register a sensor, sampling it at the minimum interval until
+        its rate of change is known.
+        """
+        self._intervals[gpio] = self._min_interval
+        self._due[gpio] = time.monotonic() if now is None else now
+
+    def _rate_of_change(self, last_datum, datum, elapsed):
+        if elapsed <= 0:
+            return 0.0
+
+        changes = [
+            abs(datum.temperature - last_datum.temperature),
+            abs(datum.dew_point - last_datum.dew_point),
+        ]
+
+        return max(
+            (change for change in changes if not isnan(change)),
+            default=0.0
+        ) / elapsed
+
+    def update(self, datum, now=None):
+        """
+        Adjust the interval of a sensor from its latest reading and
+        return the new interval.
+
+        Optionally the time.monotonic() time at which the reading was
+        taken may be specified. It defaults to the current time.
+
+        A reading with a bad status carries no new information, so the
+        sensor is sampled again at the minimum interval.
+        """
+        gpio = datum.gpio
+
+        if now is None:
+            now = time.monotonic()
+
+        if datum.status != DHT_GOOD:
+            interval = self._min_interval
+        else:
+            last_sample = self._last_samples.get(gpio)
+            self._last_samples[gpio] = (now, datum)
+
+            if last_sample is None:
+                interval = self._min_interval
+            else:
+                last_now, last_datum = last_sample
+                rate = self._rate_of_change(
+                    last_datum,
+                    datum,
+                    now - last_now
+                )
+                interval = self._intervals.get(gpio, self._min_interval)
+                interval *= self._backoff
+
+                if rate > 0:
+                    interval = min(interval, self._threshold / rate)
+
+                interval = min(
+                    max(interval, self._min_interval),
+                    self._max_interval
+                )
+
+        self._intervals[gpio] = interval
+        self._due[gpio] = now + interval
+
+        return interval
+
+    def cadence(self, gpio):
+        """
+        The current sampling interval of a sensor in seconds.
+        """
+        return self._intervals[gpio]
+
+    @property
+    def cadences(self):
+        """
+        The current sampling interval of every sensor in seconds.
+        """
+        return dict(self._intervals)
+
+    def due(self, now=None):
+        """
+        Return the sensors which should be sampled now.
+        """
+        if now is None:
+            now = time.monotonic()
+
+        return [gpio for gpio, due in self._due.items() if due <= now]
+
+    def next_due(self):
+        """
+        The time.monotonic() time at which the next sensor should be
+        sampled.
+        """
+        return min(self._due.values())
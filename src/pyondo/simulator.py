@@ -0,0 +1,127 @@
+import threading
+import time
+
+
+def encode_dhtxx(temperature, humidity):
+    """
+    Encode celsius temperature and relative humidity into the 40 bit
+    code sent by a DHTXX sensor, checksum included.
+    """
+    raw_temperature = int(round(abs(temperature) * 10))
+    raw_humidity = int(round(humidity * 10))
+
+    byte1 = raw_temperature & 0xff
+    byte2 = raw_temperature >> 8 & 0x7f
+
+    if temperature < 0:
+        byte2 |= 0x80
+
+    byte3 = raw_humidity & 0xff
+    byte4 = raw_humidity >> 8 & 0xff
+    byte0 = (byte1 + byte2 + byte3 + byte4) & 0xff
+
+    return byte4 << 32 | byte3 << 24 | byte2 << 16 | byte1 << 8 | byte0
+
+
+class _Callback:
+    def __init__(self, pi, gpio, func):
+        self._pi = pi
+        self._gpio = gpio
+        self._func = func
+
+    def cancel(self):
+        self._pi._remove_callback(self._gpio, self._func)
+
+
+class SimulatedPi:
+    """
+    A stand-in for pigpio.pi which emulates DHTXX sensors in software.
+    """
+    def __init__(self, readings=None):
+        """
+        Optionally a dictionary of GPIO to (temperature, humidity)
+        may be specified. A sensor connected to a GPIO without a
+        reading never responds, which results in a timeout.
+        """
+        self.connected = True
+
+        self._codes = {
+            gpio: encode_dhtxx(*reading)
+            for gpio, reading in (readings or {}).items()
+        }
+        self._callbacks = {}
+        self._last_ticks = {}
+        self._lock = threading.RLock()
+
+    def set_reading(self, gpio, temperature, humidity):
+        """
+        Set the temperature and humidity reported by the given GPIO.
+        """
+        self._codes[gpio] = encode_dhtxx(temperature, humidity)
+
+    def set_code(self, gpio, code):
+        """
+        Set the raw 40 bit code reported by the given GPIO, for example
+        to send a frame with a bad checksum.
+        """
+        self._codes[gpio] = code
+
+    def set_mode(self, gpio, mode):
+        pass
+
+    def get_current_tick(self):
+        return int(time.monotonic() * 1000000) & 0xffffffff
+
+    def callback(self, user_gpio, edge, func):
+        with self._lock:
+            self._callbacks.setdefault(user_gpio, []).append(func)
+
+        return _Callback(self, user_gpio, func)
+
+    def _remove_callback(self, gpio, func):
+        with self._lock:
+            funcs = self._callbacks.get(gpio, [])
+
+            if func in funcs:
+                funcs.remove(func)
+
+    def write(self, gpio, level):
+        """
+        Pulling a GPIO low triggers its sensor, which answers from a
+        separate thread in the same way pigpio delivers callbacks.
+        """
+        if level == 0 and gpio in self._codes:
+            thread = threading.Thread(target=self.emit, args=(gpio,))
+            thread.daemon = True
+            thread.start()
+
+    def emit(self, gpio, code=None):
+        """
+        Send one frame of rising edges to the callbacks of the given
+        GPIO. The frame encodes the current reading unless a raw
+        40 bit code is specified.
+        """
+        if code is None:
+            code = self._codes[gpio]
+
+        with self._lock:
+            funcs = list(self._callbacks.get(gpio, []))
+            tick = max(
+                self.get_current_tick() + 20000,
+                self._last_ticks.get(gpio, 0) + 20000
+            )
+            ticks = [tick, tick + 80, tick + 160]
+
+            for bit in range(39, -1, -1):
+                ticks.append(ticks[-1] + (120 if code >> bit & 1 else 70))
+
+            ticks = [tick & 0xffffffff for tick in ticks]
+            self._last_ticks[gpio] = ticks[-1]
+
+            # Like pigpio, deliver edges one frame at a time.
+            for tick in ticks:
+                for func in funcs:
+                    func(gpio, 1, tick)
+
+    def stop(self):
+        self.connected = False
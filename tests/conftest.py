@@ -1,9 +1,13 @@
+from collections import namedtuple
+
 import pytest
 from gpiozero import Device
 from gpiozero.pins.mock import MockFactory
 from gpiozero.pins.mock import MockPWMPin
 
 from pyondo import LedNotifier
+from pyondo.dht import DhtSensor
+from pyondo.simulator import SimulatedPi
 
 
 @pytest.yield_fixture
@@ -39,3 +43,39 @@ def led_notifier(mock_factory, pwm):
 @pytest.fixture
 def led_notifier_init(mock_factory, pwm, led_pins):
     return LedNotifier(led_pins)
+
+
+@pytest.fixture
+def simulated_pi():
+    pi = SimulatedPi({4: (21.5, 45.0)})
+    yield pi
+    pi.stop()
+
+
+@pytest.fixture(scope='module')
+def make_datum():
+    Datum = namedtuple(
+        'Datum',
+        [
+            'timestamp',
+            'gpio',
+            'status',
+            'temperature',
+            'humidity',
+            'heat_index',
+            'dew_point',
+        ]
+    )
+
+    def _make_datum(gpio, temperature, humidity, status=0, timestamp=0.0):
+        return Datum(
+            timestamp=timestamp,
+            gpio=gpio,
+            status=status,
+            temperature=temperature,
+            humidity=humidity,
+            heat_index=DhtSensor.calculate_heat_index(temperature, humidity),
+            dew_point=DhtSensor.calculate_dew_point(temperature, humidity),
+        )
+
+    return _make_datum
@@ -0,0 +1,95 @@
+import json
+
+import pytest
+
+from pyondo.aggregate import aggregate
+from pyondo.aggregate import to_message
+from pyondo.calibration import FAHRENHEIT
+from pyondo.dht import DHT_BAD_CHECKSUM
+from pyondo.dht import DHT_BAD_DATA
+from pyondo.dht import DHT_TIMEOUT
+
+
+def test_aggregate(make_datum):
+    data = [
+        make_datum(4, 20.0, 50.0, timestamp=10.0),
+        make_datum(7, 24.0, 50.0, timestamp=11.0),
+        make_datum(8, 30.0, 50.0, status=DHT_BAD_CHECKSUM),
+        make_datum(9, 0.0, 0.0, status=DHT_TIMEOUT),
+    ]
+
+    message = aggregate('pi', data)
+
+    assert message['host'] == 'pi'
+    assert message['unit'] == 'C'
+    assert message['timestamp'] == 0.0
+    assert [reading['gpio'] for reading in message['readings']] == [4, 7]
+    assert message['rollup']['temperature'] == {
+        'min': 20.0,
+        'max': 24.0,
+        'mean': 22.0,
+    }
+    assert message['rollup']['bad_status_count'] == 2
+
+
+def test_aggregate_with_status_filter(make_datum):
+    data = [
+        make_datum(4, 20.0, 50.0),
+        make_datum(7, 30.0, 50.0, status=DHT_BAD_CHECKSUM),
+        make_datum(8, 40.0, 50.0, status=DHT_BAD_DATA),
+    ]
+
+    message = aggregate('pi', data, DHT_BAD_CHECKSUM)
+
+    assert [reading['gpio'] for reading in message['readings']] == [4, 7]
+    assert message['rollup']['temperature']['max'] == 30.0
+    assert message['rollup']['bad_status_count'] == 2
+
+
+def test_aggregate_without_valid_dew_point(make_datum):
+    message = aggregate('pi', [make_datum(4, 20.0, 0.0)])
+
+    assert message['rollup']['temperature'] is not None
+    assert message['rollup']['dew_point'] is None
+
+
+def test_aggregate_empty_sweep():
+    message = aggregate('pi', [])
+
+    assert message['timestamp'] is None
+    assert message['readings'] == []
+    assert json.loads(json.dumps(message))['rollup'] == {
+        'temperature': None,
+        'dew_point': None,
+        'bad_status_count': 0,
+    }
+
+
+def test_message_unit(make_datum):
+    datum = make_datum(4, 20.0, 50.0)
+
+    assert to_message(datum)['unit'] == 'C'
+    assert to_message(datum, FAHRENHEIT)['unit'] == 'F'
+    assert aggregate('pi', [datum], unit=FAHRENHEIT)['unit'] == 'F'
+
+
+def _reject_constant(constant):
+    raise ValueError('Invalid JSON constant: {}'.format(constant))
+
+
+def test_messages_are_strict_json(make_datum):
+    data = [make_datum(4, 20.0, 50.0), make_datum(7, 20.0, 0.5)]
+
+    message = json.loads(
+        json.dumps(aggregate('pi', data)),
+        parse_constant=_reject_constant
+    )
+
+    assert message['readings'][1]['dew_point'] is None
+    assert json.loads(
+        json.dumps(to_message(data[1])),
+        parse_constant=_reject_constant
+    )['dew_point'] is None
+
+    with pytest.raises(ValueError):
+        json.loads('{"dew_point": NaN}', parse_constant=_reject_constant)
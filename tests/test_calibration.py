@@ -0,0 +1,113 @@
+import pytest
+
+from pyondo.calibration import FAHRENHEIT
+from pyondo.calibration import Calibrator
+from pyondo.calibration import linear
+from pyondo.calibration import piecewise
+from pyondo.dht import DhtSensor
+
+
+def test_linear_correction():
+    assert linear(gain=2.0, offset=-1.0)(3.0) == 5.0
+
+
+@pytest.mark.parametrize(
+    'raw, corrected', [
+        (0.0, 0.0),
+        (25.0, 26.0),
+        (50.0, 52.0),
+        (75.0, 77.0),
+        (-10.0, -10.4),
+        (150.0, 152.0),
+    ]
+)
+def test_piecewise_correction(raw, corrected):
+    correct = piecewise([[50.0, 52.0], [0.0, 0.0], [100.0, 102.0]])
+
+    assert correct(raw) == pytest.approx(corrected)
+
+
+def test_piecewise_correction_with_invalid_points():
+    with pytest.raises(ValueError):
+        piecewise([[0.0, 0.0]])
+
+    with pytest.raises(ValueError):
+        piecewise([[0.0, 0.0], [0.0, 1.0]])
+
+
+@pytest.mark.parametrize(
+    'table', [
+        {4: {'temperature': {'ofset': -0.5}}},
+        {4: {'temp': {'offset': -0.5}}},
+        {4: {'humidity': {'points': [[0, 0], [100, 98]], 'gain': 1.1}}},
+        {'four': {'temperature': {'offset': -0.5}}},
+        {None: {'temperature': {'offset': -0.5}}},
+        [{'temperature': {'offset': -0.5}}],
+        {4: 5},
+        {4: {'temperature': 5}},
+        {4: {'temperature': {'gain': '2'}}},
+        {4: {'temperature': {'offset': True}}},
+        {4: {'temperature': {'points': 5}}},
+        {4: {'temperature': {'points': [[0, 0], [100]]}}},
+        {4: {'temperature': {'points': [[0, 0], [100, '98']]}}},
+    ]
+)
+def test_invalid_calibration_table(table):
+    with pytest.raises(ValueError):
+        Calibrator(table)
+
+
+def test_uncalibrated_datum_is_unchanged(make_datum):
+    datum = make_datum(4, 21.0, 50.0)
+
+    assert Calibrator().apply(datum) is datum
+
+
+def test_calibrated_datum(make_datum):
+    calibrator = Calibrator({
+        '4': {
+            'temperature': {'offset': -1.0},
+            'humidity': {'gain': 1.1},
+        },
+    })
+    datum = calibrator.apply(make_datum(4, 21.0, 50.0))
+
+    assert datum.temperature == pytest.approx(20.0)
+    assert datum.humidity == pytest.approx(55.0)
+    assert datum.dew_point == pytest.approx(
+        DhtSensor.calculate_dew_point(20.0, 55.0))
+
+
+def test_fahrenheit_datum(make_datum):
+    datum = Calibrator(unit=FAHRENHEIT).apply(make_datum(4, 20.0, 50.0))
+
+    assert datum.temperature == pytest.approx(68.0)
+    assert datum.humidity == 50.0
+
+
+def test_apply_all(make_datum):
+    calibrator = Calibrator({4: {'temperature': {'offset': 1.0}}})
+    data = [make_datum(4, 20.0, 50.0), make_datum(7, 20.0, 50.0)]
+
+    result = calibrator.apply_all(data)
+
+    assert [datum.temperature for datum in result] == [21.0, 20.0]
+
+
+@pytest.mark.parametrize('unit', ['C', FAHRENHEIT])
+def test_apply_all_matches_apply(make_datum, unit):
+    calibrator = Calibrator(
+        {
+            4: {'temperature': {'offset': 1.0}},
+            7: {'humidity': {'points': [[0, 0], [50, 48], [100, 98]]}},
+        },
+        unit
+    )
+    data = [
+        make_datum(gpio, temperature, 50.0)
+        for temperature in (18.0, 21.0, 24.0)
+        for gpio in (4, 7, 8)
+    ]
+
+    assert calibrator.apply_all(iter(data)) == [
+        calibrator.apply(datum) for datum in data]
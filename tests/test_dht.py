@@ -0,0 +1,111 @@
+import threading
+import time
+
+import pytest
+
+from pyondo.dht import DHT_BAD_CHECKSUM
+from pyondo.dht import DHT_GOOD
+from pyondo.dht import DHT_TIMEOUT
+from pyondo.dht import DHTXX
+from pyondo.dht import DhtSensor
+from pyondo.simulator import encode_dhtxx
+
+READINGS = [(21.5, 45.0), (-3.2, 88.8)]
+
+
+@pytest.fixture
+def sensor(simulated_pi):
+    sensor = DhtSensor(pi=simulated_pi, gpio=4, model=DHTXX)
+    yield sensor
+    sensor.cancel()
+
+
+@pytest.mark.parametrize('temperature, humidity', READINGS)
+def test_read(simulated_pi, sensor, temperature, humidity):
+    simulated_pi.set_reading(4, temperature, humidity)
+
+    datum = sensor.read()
+
+    assert datum.status == DHT_GOOD
+    assert datum.temperature == temperature
+    assert datum.humidity == humidity
+    assert sensor.latest is datum
+
+
+def test_read_timeout(simulated_pi):
+    sensor = DhtSensor(pi=simulated_pi, gpio=7, model=DHTXX)
+
+    assert sensor.read().status == DHT_TIMEOUT
+
+    sensor.cancel()
+
+
+def test_bad_checksum_keeps_last_reading(simulated_pi, sensor):
+    sensor.read()
+    simulated_pi.set_code(4, encode_dhtxx(30.0, 60.0) ^ 1)
+
+    datum = sensor.read()
+
+    assert datum.status == DHT_BAD_CHECKSUM
+    assert datum.temperature == 21.5
+    assert datum.humidity == 45.0
+    assert sensor.latest is datum
+
+
+def test_concurrent_reads_see_whole_readings(
+    monkeypatch,
+    simulated_pi,
+    sensor
+):
+    calculate_heat_index = DhtSensor.calculate_heat_index
+
+    def _slow_heat_index(temperature, humidity):
+        # Yield while the datum is half built, as a slow Pi would,
+        # so that frames keep being decoded in the meantime.
+        time.sleep(0.0001)
+        return calculate_heat_index(temperature, humidity)
+
+    monkeypatch.setattr(
+        DhtSensor,
+        'calculate_heat_index',
+        staticmethod(_slow_heat_index)
+    )
+    stop = threading.Event()
+    data = []
+
+    def _emit():
+        index = 0
+
+        while not stop.is_set():
+            simulated_pi.emit(4, encode_dhtxx(*READINGS[index % 2]))
+            index += 1
+
+    def _read():
+        for _ in range(50):
+            data.append(sensor.read())
+
+    simulated_pi.set_reading(4, *READINGS[0])
+    simulated_pi.emit(4)
+
+    emitter = threading.Thread(target=_emit)
+    readers = [threading.Thread(target=_read) for _ in range(4)]
+    try:
+        emitter.start()
+
+        for reader in readers:
+            reader.start()
+
+        for reader in readers:
+            reader.join()
+    finally:
+        stop.set()
+        emitter.join()
+
+    assert len(data) == 200
+
+    for datum in data:
+        assert (datum.temperature, datum.humidity) in READINGS
+        assert datum.heat_index == calculate_heat_index(
+            datum.temperature, datum.humidity)
+        assert datum.dew_point == DhtSensor.calculate_dew_point(
+            datum.temperature, datum.humidity)
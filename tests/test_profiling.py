@@ -0,0 +1,75 @@
+from pyondo.dht import DHTXX
+from pyondo.dht import DhtSensor
+from pyondo.profiling import CALLBACK
+from pyondo.profiling import DECODE
+from pyondo.profiling import PUBLISH
+from pyondo.profiling import STAGES
+from pyondo.profiling import TRIGGER
+from pyondo.profiling import Profiler
+
+
+def test_summary():
+    profiler = Profiler()
+
+    for elapsed in range(1, 101):
+        profiler.record(4, TRIGGER, elapsed * 1000000)
+
+    summary = profiler.summary()
+
+    assert summary[TRIGGER] == {
+        'count': 100,
+        'mean': 50.5,
+        'p50': 50.0,
+        'p90': 90.0,
+        'p99': 99.0,
+        'max': 100.0,
+    }
+    assert summary[DECODE] is None
+
+
+def test_collapsed():
+    profiler = Profiler()
+    profiler.record(4, TRIGGER, 1500000)
+    profiler.record(4, TRIGGER, 500000)
+
+    assert profiler.collapsed() == ['pyondo;read;trigger 2000']
+
+
+def test_hooks_receive_every_stage(simulated_pi):
+    records = []
+    profiler = Profiler(hooks=[lambda *record: records.append(record)])
+    sensor = DhtSensor(
+        pi=simulated_pi,
+        gpio=4,
+        model=DHTXX,
+        callback=lambda datum: None,
+        profiler=profiler
+    )
+
+    sensor.read()
+    simulated_pi.emit(4)
+    sensor.cancel()
+
+    assert {stage for _, stage, _ in records} == set(STAGES) - {PUBLISH}
+    assert all(gpio == 4 and elapsed >= 0 for gpio, _, elapsed in records)
+
+
+def test_callback_stage_requires_callback(simulated_pi):
+    profiler = Profiler()
+    sensor = DhtSensor(pi=simulated_pi, gpio=4, profiler=profiler)
+
+    sensor.read()
+    sensor.cancel()
+
+    assert profiler.samples(CALLBACK) == []
+    assert len(profiler.samples(TRIGGER)) == 1
+
+
+def test_publish_stage_has_no_gpio():
+    records = []
+    profiler = Profiler(hooks=[lambda *record: records.append(record)])
+
+    profiler.record(None, PUBLISH, 1000000)
+
+    assert records == [(None, PUBLISH, 1000000)]
+    assert profiler.collapsed() == ['pyondo;sweep;publish 1000']
@@ -0,0 +1,74 @@
+import pytest
+
+from pyondo.dht import DHT_TIMEOUT
+from pyondo.scheduler import AdaptiveScheduler
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = AdaptiveScheduler(max_interval=60.0, threshold=0.2)
+    scheduler.add(4, now=0.0)
+
+    return scheduler
+
+
+def test_invalid_intervals():
+    with pytest.raises(ValueError):
+        AdaptiveScheduler(min_interval=1.0)
+
+    with pytest.raises(ValueError):
+        AdaptiveScheduler(max_interval=10.0, min_interval=20.0)
+
+
+def test_new_sensor_is_due(scheduler):
+    assert scheduler.due(now=0.0) == [4]
+    assert scheduler.cadence(4) == 2.0
+
+
+def test_back_off_when_stable(make_datum, scheduler):
+    now = 0.0
+
+    for _ in range(20):
+        scheduler.update(make_datum(4, 20.0, 50.0), now)
+        now += scheduler.cadence(4)
+
+    assert scheduler.cadence(4) == 60.0
+    assert scheduler.cadences == {4: 60.0}
+
+
+def test_speed_up_on_transient(make_datum, scheduler):
+    scheduler.update(make_datum(4, 20.0, 50.0), 0.0)
+    scheduler.update(make_datum(4, 20.0, 50.0), 2.0)
+    scheduler.update(make_datum(4, 20.0, 50.0), 5.0)
+
+    assert scheduler.cadence(4) > 2.0
+
+    interval = scheduler.update(make_datum(4, 25.0, 50.0), 9.5)
+
+    assert interval == 2.0
+    assert scheduler.due(now=11.0) == []
+    assert scheduler.due(now=11.5) == [4]
+
+
+def test_follow_rate_of_change(make_datum, scheduler):
+    scheduler.update(make_datum(4, 20.0, 50.0), 0.0)
+    interval = scheduler.update(make_datum(4, 20.1, 50.0), 2.0)
+
+    assert 2.0 < interval <= 3.0
+
+
+def test_bad_status_resets_cadence(make_datum, scheduler):
+    scheduler.update(make_datum(4, 20.0, 50.0), 0.0)
+    scheduler.update(make_datum(4, 20.0, 50.0), 2.0)
+    scheduler.update(make_datum(4, 20.0, 50.0, status=DHT_TIMEOUT), 5.0)
+
+    assert scheduler.cadence(4) == 2.0
+    assert scheduler.next_due() == 7.0
+
+
+def test_wall_clock_steps_are_ignored(make_datum, scheduler):
+    scheduler.update(make_datum(4, 20.0, 50.0, timestamp=1e9), 0.0)
+    interval = scheduler.update(make_datum(4, 20.0, 50.0, timestamp=0.0), 2.0)
+
+    assert interval == 3.0
+    assert scheduler.next_due() == 5.0